@@ -8,6 +8,33 @@ class Settings(BaseSettings):
     ai_mode: str = os.getenv("AI_MODE", "mock")
     gemini_api_key: str = os.getenv("GEMINI_API_KEY", "")
 
+    # Circuit breaker around the Gemini provider
+    gemini_breaker_failure_threshold: int = int(os.getenv("GEMINI_BREAKER_FAILURE_THRESHOLD", "5"))
+    gemini_breaker_recovery_timeout: float = float(os.getenv("GEMINI_BREAKER_RECOVERY_TIMEOUT", "30"))
+    gemini_breaker_half_open_max_calls: int = int(os.getenv("GEMINI_BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+    # "fallback" serves mock apps while the breaker is open, "fail_fast" returns 503
+    gemini_breaker_policy: str = os.getenv("GEMINI_BREAKER_POLICY", "fallback")
+
+    # Per-request deadline for live generation (seconds, 0 disables) and the
+    # size of the dedicated thread pool used for Gemini calls
+    gemini_request_timeout: float = float(os.getenv("GEMINI_REQUEST_TIMEOUT", "60"))
+    gemini_max_workers: int = int(os.getenv("GEMINI_MAX_WORKERS", "4"))
+
+    # Per-stage tracing: "memory" (ring buffer behind /debug/traces), "jsonl" or "none"
+    trace_exporter: str = os.getenv("TRACE_EXPORTER", "memory")
+    trace_file: str = os.getenv("TRACE_FILE", "traces.jsonl")
+    trace_buffer_size: int = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+
+    # Mock generation: default template variant and whether files are written
+    # to disk (false returns contents in memory, for load tests and demos)
+    mock_template: str = os.getenv("MOCK_TEMPLATE", "basic")
+    mock_write_files: bool = os.getenv("MOCK_WRITE_FILES", "true").lower() == "true"
+
+    # Smoke test each generated backend in a worker process after generation
+    verify_generated: bool = os.getenv("VERIFY_GENERATED", "false").lower() == "true"
+    verify_workers: int = int(os.getenv("VERIFY_WORKERS", "2"))
+    verify_timeout: float = float(os.getenv("VERIFY_TIMEOUT", "30"))
+
     @property
     def gemini_configured(self):
         return bool(self.gemini_api_key)
@@ -19,6 +46,10 @@ class Settings(BaseSettings):
     def validate(self):
         if self.ai_mode == "live" and not self.gemini_configured:
             raise ValueError("AI_MODE is 'live' but GEMINI_API_KEY is missing.")
+        if self.gemini_breaker_policy not in ("fallback", "fail_fast"):
+            raise ValueError("GEMINI_BREAKER_POLICY must be 'fallback' or 'fail_fast'.")
+        if self.trace_exporter not in ("memory", "jsonl", "none"):
+            raise ValueError("TRACE_EXPORTER must be 'memory', 'jsonl' or 'none'.")
 
 settings = Settings()
 try:
@@ -7,9 +7,27 @@ import logging
 from dotenv import load_dotenv
 import os
 import uuid
+from typing import Optional
 
 from backend.app.core.config import settings
+from backend.app.models.health_models import (
+    CircuitBreakerState,
+    DebugResponse,
+    DocsLinkResponse,
+    HealthResponse,
+    InfoResponse,
+    MetricsResponse,
+    PingResponse,
+    RootResponse,
+    StatusResponse,
+    TracesResponse,
+    VersionResponse,
+)
 from backend.app.routes.generate import router as generate_router
+from backend.app.routes.apps import router as apps_router
+from backend.app.services.codegen import gemini_breaker, gemini_executor
+from backend.app.services import tracing
+from backend.app.services.deadline import DisconnectMiddleware
 
 # Load environment variables
 load_dotenv()
@@ -44,42 +62,44 @@ app.add_middleware(
 
 # Routers
 app.include_router(generate_router, prefix="/api/v1", tags=["generation"])
+app.include_router(apps_router, prefix="/api/v1", tags=["apps"])
 
 
-@app.get("/", tags=["root"])
-async def root():
+@app.get("/", tags=["root"], response_model=RootResponse)
+async def root() -> RootResponse:
     """Root welcome endpoint."""
-    return {
-        "message": f"Welcome to {settings.app_name}!",
-        "version": "1.0.0",
-        "ai_mode": settings.ai_mode
-    }
+    return RootResponse(
+        message=f"Welcome to {settings.app_name}!",
+        version="1.0.0",
+        ai_mode=settings.ai_mode
+    )
 
 
-@app.get("/health", tags=["system"])
-async def health():
+@app.get("/health", tags=["system"], response_model=HealthResponse)
+async def health() -> HealthResponse:
     """Health check endpoint for monitoring/deployment."""
-    return {
-        "status": "healthy",
-        "app_name": settings.app_name,
-        "ai_mode": settings.ai_mode,
-        "gemini_configured": bool(settings.gemini_api_key),
-        "live_mode": settings.ai_mode == "live" and bool(settings.gemini_api_key)
-    }
+    return HealthResponse(
+        status="healthy",
+        app_name=settings.app_name,
+        ai_mode=settings.ai_mode,
+        gemini_configured=bool(settings.gemini_api_key),
+        live_mode=settings.ai_mode == "live" and bool(settings.gemini_api_key),
+        gemini_circuit=CircuitBreakerState(**gemini_breaker.snapshot())
+    )
 
 
-@app.get("/status", tags=["system"])
-async def status():
+@app.get("/status", tags=["system"], response_model=StatusResponse)
+async def status() -> StatusResponse:
     """Detailed status endpoint for diagnostics."""
-    return {
-        "status": "healthy",
-        "app_name": settings.app_name,
-        "ai_mode": settings.ai_mode,
-        "gemini_configured": bool(settings.gemini_api_key),
-        "live_mode": settings.ai_mode == "live" and bool(settings.gemini_api_key),
-        "docs_url": app.docs_url,
-        "redoc_url": app.redoc_url
-    }
+    return StatusResponse(
+        status="healthy",
+        app_name=settings.app_name,
+        ai_mode=settings.ai_mode,
+        gemini_configured=bool(settings.gemini_api_key),
+        live_mode=settings.ai_mode == "live" and bool(settings.gemini_api_key),
+        docs_url=app.docs_url,
+        redoc_url=app.redoc_url
+    )
 
 
 @app.on_event("startup")
@@ -92,6 +112,12 @@ def validate_env():
         logger.info("Gemini API key loaded. Backend will run in live mode if AI_MODE=live.")
 
 
+@app.on_event("shutdown")
+def shutdown_executors():
+    gemini_executor.shutdown(wait=False, cancel_futures=True)
+    tracing.shutdown_exporter()
+
+
 # Security headers middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -103,13 +129,22 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 
-# Request ID middleware for traceability
+SYSTEM_PATHS = {"/health", "/status", "/metrics", "/ping", "/version", "/debug/traces"}
+
+
+# Request ID middleware for traceability, also collects per-stage spans
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
-    response = await call_next(request)
+    with tracing.start_trace(request_id) as trace:
+        # Polled system endpoints still get Server-Timing, but their spans would
+        # crowd generation spans out of the exporter
+        exported = request.url.path not in SYSTEM_PATHS
+        with tracing.span("total", exported=exported, method=request.method, path=request.url.path):
+            response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
+    response.headers["Server-Timing"] = trace.server_timing()
     return response
 
 
@@ -125,7 +160,11 @@ async def log_requests(request: Request, call_next):
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request, exc):
     logger.error(f"HTTP error: {exc.detail}")
-    return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error": exc.detail},
+        headers=getattr(exc, "headers", None)
+    )
 
 
 @app.exception_handler(RequestValidationError)
@@ -140,12 +179,12 @@ async def global_exception_handler(request, exc):
     return JSONResponse(status_code=500, content={"error": "Internal server error", "details": str(exc)})
 
 
-@app.get("/version", tags=["system"])
-async def version():
-    return {
-        "app_name": settings.app_name,
-        "version": "1.0.0"
-    }
+@app.get("/version", tags=["system"], response_model=VersionResponse)
+async def version() -> VersionResponse:
+    return VersionResponse(
+        app_name=settings.app_name,
+        version="1.0.0"
+    )
 
 
 api_call_count = 0
@@ -160,40 +199,53 @@ async def count_api_calls(request: Request, call_next):
     response = await call_next(request)
     return response
 
-@app.get("/metrics", tags=["system"])
-async def metrics():
-    return {
-        "api_call_count": api_call_count,
-        "uptime_seconds": int((os.times().elapsed if hasattr(os.times(), 'elapsed') else 0))
-    }
-
-@app.get("/ping", tags=["system"])
-async def ping():
-    return {"ping": "pong"}
-
-@app.get("/info", tags=["system"])
-async def info():
-    return {
-        "app_name": settings.app_name,
-        "ai_mode": settings.ai_mode,
-        "gemini_configured": bool(settings.gemini_api_key),
-        "env": dict(os.environ),
-    }
-
-@app.get("/docs-link", tags=["system"])
-async def docs_link():
-    return {"docs_url": app.docs_url, "redoc_url": app.redoc_url}
-
-@app.get("/debug", tags=["system"])
+# Added last so it wraps every "http" middleware above and sees the raw
+# receive channel; routes use it to cancel work for disconnected clients
+app.add_middleware(DisconnectMiddleware)
+
+@app.get("/metrics", tags=["system"], response_model=MetricsResponse)
+async def metrics() -> MetricsResponse:
+    return MetricsResponse(
+        api_call_count=api_call_count,
+        uptime_seconds=int((os.times().elapsed if hasattr(os.times(), 'elapsed') else 0)),
+        gemini_circuit=CircuitBreakerState(**gemini_breaker.snapshot())
+    )
+
+@app.get("/ping", tags=["system"], response_model=PingResponse)
+async def ping() -> PingResponse:
+    return PingResponse(ping="pong")
+
+@app.get("/info", tags=["system"], response_model=InfoResponse)
+async def info() -> InfoResponse:
+    return InfoResponse(
+        app_name=settings.app_name,
+        ai_mode=settings.ai_mode,
+        gemini_configured=bool(settings.gemini_api_key),
+        env=dict(os.environ),
+    )
+
+@app.get("/docs-link", tags=["system"], response_model=DocsLinkResponse)
+async def docs_link() -> DocsLinkResponse:
+    return DocsLinkResponse(docs_url=app.docs_url, redoc_url=app.redoc_url)
+
+@app.get("/debug/traces", tags=["system"], response_model=TracesResponse)
+async def debug_traces(request_id: Optional[str] = None):
+    """Recent spans from the in-memory trace exporter."""
+    if os.getenv("DEBUG", "false").lower() != "true":
+        return JSONResponse(status_code=403, content={"error": "Debug mode not enabled"})
+    return TracesResponse(spans=tracing.get_exporter().recent(request_id))
+
+
+@app.get("/debug", tags=["system"], response_model=DebugResponse)
 async def debug(request: Request):
     if os.getenv("DEBUG", "false").lower() != "true":
         return JSONResponse(status_code=403, content={"error": "Debug mode not enabled"})
-    return {
-        "request_headers": dict(request.headers),
-        "request_id": getattr(request.state, "request_id", None),
-        "settings": {"ai_mode": settings.ai_mode, "gemini_api_key": bool(settings.gemini_api_key)},
-        "env": dict(os.environ)
-    }
+    return DebugResponse(
+        request_headers=dict(request.headers),
+        request_id=getattr(request.state, "request_id", None),
+        settings={"ai_mode": settings.ai_mode, "gemini_api_key": bool(settings.gemini_api_key)},
+        env=dict(os.environ)
+    )
 
 
 if __name__ == "__main__":
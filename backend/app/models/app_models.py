@@ -1,3 +1,47 @@
 from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
-# ...existing code...
\ No newline at end of file
+
+class RouteCheck(BaseModel):
+    path: str
+    status_code: int
+    latency_ms: float
+    passed: bool
+
+
+class VerificationResult(BaseModel):
+    slug: str
+    passed: bool
+    error: Optional[str] = None
+    import_ms: Optional[float] = None
+    routes: List[RouteCheck] = []
+    verified_at: str
+
+
+class RefineRequest(BaseModel):
+    change_request: str
+    target: Optional[str] = Field(None, description="backend or frontend; guessed when omitted")
+
+
+class RefineResponse(BaseModel):
+    message: str
+    slug: str
+    file: str
+    target: str
+    version: int
+    blocks_applied: int
+    mode: str
+    verification: Optional[VerificationResult] = None
+
+
+class AppVersion(BaseModel):
+    version: int
+    change_request: Optional[str] = None
+    files: Dict[str, str]
+    created_at: str
+    mode: str
+
+
+class VersionsResponse(BaseModel):
+    slug: str
+    versions: List[AppVersion]
@@ -1,3 +1,31 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
-# ...existing code...
\ No newline at end of file
+from backend.app.models.app_models import VerificationResult
+
+
+class GenerationRequest(BaseModel):
+    idea: str
+    template: Optional[str] = Field(None, description="Mock template variant, defaults to MOCK_TEMPLATE")
+    write_files: Optional[bool] = Field(None, description="Mock only, defaults to MOCK_WRITE_FILES")
+
+
+class GeneratedFiles(BaseModel):
+    backend: str
+    frontend: str
+
+
+class GenerationResponse(BaseModel):
+    message: str
+    mode: str
+    # Paths of the written files, or the sources themselves in write-less mode
+    generated_files: Optional[GeneratedFiles] = None
+    files: Optional[GeneratedFiles] = None
+    verification: Optional[VerificationResult] = None
+
+
+class ModesResponse(BaseModel):
+    available_modes: List[str]
+    current_mode: str
+    mock_templates: List[str]
+    gemini_configured: bool
@@ -1,3 +1,84 @@
 from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 
-# ...existing code...
\ No newline at end of file
+
+class CircuitBreakerState(BaseModel):
+    state: str = Field(..., description="closed, open or half_open")
+    consecutive_failures: int
+    failure_threshold: int
+    recovery_timeout_seconds: float
+    retry_after_seconds: float
+    total_failures: int
+    total_rejections: int
+    times_opened: int
+
+
+class RootResponse(BaseModel):
+    message: str
+    version: str
+    ai_mode: str
+
+
+class HealthResponse(BaseModel):
+    status: str
+    app_name: str
+    ai_mode: str
+    gemini_configured: bool
+    live_mode: bool
+    gemini_circuit: CircuitBreakerState
+
+
+class StatusResponse(BaseModel):
+    status: str
+    app_name: str
+    ai_mode: str
+    gemini_configured: bool
+    live_mode: bool
+    docs_url: Optional[str] = None
+    redoc_url: Optional[str] = None
+
+
+class MetricsResponse(BaseModel):
+    api_call_count: int
+    uptime_seconds: int
+    gemini_circuit: CircuitBreakerState
+
+
+class VersionResponse(BaseModel):
+    app_name: str
+    version: str
+
+
+class PingResponse(BaseModel):
+    ping: str
+
+
+class InfoResponse(BaseModel):
+    app_name: str
+    ai_mode: str
+    gemini_configured: bool
+    env: Dict[str, str]
+
+
+class DocsLinkResponse(BaseModel):
+    docs_url: Optional[str] = None
+    redoc_url: Optional[str] = None
+
+
+class DebugResponse(BaseModel):
+    request_headers: Dict[str, str]
+    request_id: Optional[str] = None
+    settings: Dict[str, Any]
+    env: Dict[str, str]
+
+
+class SpanRecord(BaseModel):
+    name: str
+    request_id: Optional[str] = None
+    start: float
+    duration_ms: float
+    attributes: Dict[str, Any] = {}
+
+
+class TracesResponse(BaseModel):
+    spans: List[SpanRecord]
@@ -0,0 +1,83 @@
+from fastapi import APIRouter, HTTPException, Request
+import math
+
+from backend.app.core.config import settings
+from backend.app.models.app_models import (
+    RefineRequest,
+    RefineResponse,
+    VerificationResult,
+    VersionsResponse,
+)
+from backend.app.services.circuit_breaker import CircuitOpenError
+from backend.app.services.codegen import new_generation_deadline
+from backend.app.services.deadline import (
+    ClientDisconnected,
+    DeadlineExceeded,
+    cancel_on_disconnect,
+)
+from backend.app.services.refine import (
+    AppNotFoundError,
+    PatchError,
+    list_versions,
+    refine_app,
+)
+from backend.app.services.tracing import span
+from backend.app.services.verify import verify_generated_app
+
+router = APIRouter()
+
+
+@router.post(
+    "/apps/{slug}/refine",
+    response_model=RefineResponse,
+    response_model_exclude_unset=True
+)
+async def refine(slug: str, request: RefineRequest, http_request: Request) -> RefineResponse:
+    """Apply a change request to an existing app instead of regenerating it."""
+    if not request.change_request or not request.change_request.strip():
+        raise HTTPException(status_code=400, detail="Change request cannot be empty")
+
+    try:
+        result = await cancel_on_disconnect(
+            http_request,
+            refine_app(
+                slug,
+                request.change_request.strip(),
+                target=request.target,
+                deadline=new_generation_deadline()
+            )
+        )
+        response = RefineResponse(message="App refined successfully!", **result)
+
+        if settings.verify_generated and result["target"] == "backend":
+            with span("verify"):
+                response.verification = VerificationResult(**await verify_generated_app(result["file"]))
+        return response
+
+    except AppNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except PatchError as e:
+        raise HTTPException(status_code=502, detail=f"Could not apply model output: {str(e)}")
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnected as e:
+        raise HTTPException(status_code=499, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to refine app: {str(e)}")
+
+
+@router.get("/apps/{slug}/versions", response_model=VersionsResponse)
+async def get_versions(slug: str) -> VersionsResponse:
+    """Version history recorded by previous refinements."""
+    try:
+        return VersionsResponse(slug=slug, versions=list_versions(slug))
+    except AppNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
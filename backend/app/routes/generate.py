@@ -1,53 +1,130 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from typing import Dict
-import asyncio
+from fastapi import APIRouter, HTTPException, Request
+import math
+import logging
+import os
+from slugify import slugify
 
 from backend.app.core.config import settings
-from backend.app.services.codegen import generate_mock_app, generate_live_app
+from backend.app.models.generation_models import (
+    GeneratedFiles,
+    GenerationRequest,
+    GenerationResponse,
+    ModesResponse,
+)
+from backend.app.models.app_models import VerificationResult
+from backend.app.services.codegen import (
+    generate_mock_app,
+    generate_live_app,
+    new_generation_deadline,
+    render_mock_app,
+)
+from backend.app.services.templates import engine as mock_templates
+from backend.app.services.circuit_breaker import CircuitOpenError
+from backend.app.services.refine import app_lock, record_generation
+from backend.app.services.deadline import (
+    ClientDisconnected,
+    DeadlineExceeded,
+    cancel_on_disconnect,
+)
+from backend.app.services.tracing import span
+from backend.app.services.verify import verify_generated_app
 
 router = APIRouter()
+logger = logging.getLogger("zulu-ai-api")
 
 
-class GenerationRequest(BaseModel):
-    idea: str
-
-
-@router.post("/generate_app")
-async def generate_app(request: GenerationRequest) -> Dict:
+@router.post(
+    "/generate_app",
+    response_model=GenerationResponse,
+    response_model_exclude_unset=True
+)
+async def generate_app(request: GenerationRequest, http_request: Request) -> GenerationResponse:
     """Generate an application based on the provided idea."""
     if not request.idea or not request.idea.strip():
         raise HTTPException(status_code=400, detail="Idea cannot be empty")
     
     try:
-        if settings.ai_mode.lower() == "live":
-            # Use Gemini AI to generate the app
-            generated_files = await generate_live_app(request.idea.strip())
-            return {
-                "message": "App generated with Gemini AI!",
-                "generated_files": generated_files,
-                "mode": "live"
-            }
-        else:
-            # Use mock generation
-            generated_files = generate_mock_app(request.idea.strip())
-            return {
-                "message": "Mock app generated successfully!",
-                "generated_files": generated_files,
-                "mode": "mock"
-            }
+        # Regenerating rewrites the app's files, so it must not interleave with a
+        # refine of the same app that is waiting on Gemini
+        async with app_lock(slugify(request.idea.strip())):
+            if settings.ai_mode.lower() == "live":
+                # Use Gemini AI to generate the app
+                # Stop generating (and spending upstream quota) once the client is gone
+                try:
+                    generated_files = await cancel_on_disconnect(
+                        http_request,
+                        generate_live_app(request.idea.strip(), new_generation_deadline())
+                    )
+                    response = GenerationResponse(
+                        message="App generated with Gemini AI!",
+                        generated_files=GeneratedFiles(**generated_files),
+                        mode="live"
+                    )
+                except CircuitOpenError as e:
+                    if settings.gemini_breaker_policy != "fallback":
+                        raise
+                    # Make the outage visible to clients instead of posing as live output
+                    logger.warning(f"{e}. Falling back to mock generation.")
+                    generated_files = generate_mock_app(request.idea.strip())
+                    response = GenerationResponse(
+                        message="Gemini is unavailable; fell back to mock generation.",
+                        generated_files=GeneratedFiles(**generated_files),
+                        mode="mock"
+                    )
+            else:
+                # Use mock generation
+                write_files = settings.mock_write_files if request.write_files is None else request.write_files
+                if write_files:
+                    generated_files = generate_mock_app(request.idea.strip(), request.template)
+                    response = GenerationResponse(
+                        message="Mock app generated successfully!",
+                        generated_files=GeneratedFiles(**generated_files),
+                        mode="mock"
+                    )
+                else:
+                    # Write-less mode: hand back the sources without touching disk
+                    with span("mock_render"):
+                        contents = render_mock_app(request.idea.strip(), request.template)
+                    return GenerationResponse(
+                        message="Mock app generated successfully!",
+                        files=GeneratedFiles(**contents),
+                        mode="mock"
+                    )
+
+            # A regeneration starts a new entry in the app's version history
+            with span("record_version"):
+                record_generation(os.path.dirname(os.path.dirname(generated_files["backend"])))
+
+        if settings.verify_generated:
+            with span("verify"):
+                response.verification = VerificationResult(
+                    **await verify_generated_app(generated_files["backend"])
+                )
+        return response
     
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ClientDisconnected as e:
+        # Nobody is listening; 499 only shows up in our own logs
+        raise HTTPException(status_code=499, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate app: {str(e)}")
 
 
-@router.get("/modes")
-async def get_modes():
+@router.get("/modes", response_model=ModesResponse)
+async def get_modes() -> ModesResponse:
     """Get available AI modes and current mode."""
-    return {
-        "available_modes": ["mock", "live"],
-        "current_mode": settings.ai_mode,
-        "gemini_configured": settings.gemini_api_key is not None
-    }
\ No newline at end of file
+    return ModesResponse(
+        available_modes=["mock", "live"],
+        current_mode=settings.ai_mode,
+        mock_templates=mock_templates.variants,
+        gemini_configured=settings.gemini_api_key is not None
+    )
\ No newline at end of file
@@ -0,0 +1,156 @@
+import time
+import threading
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("zulu-ai-api")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for an upstream provider.
+
+    The breaker opens after ``failure_threshold`` consecutive failures and
+    rejects calls until ``recovery_timeout`` seconds have passed. It then
+    lets up to ``half_open_max_calls`` trial calls through: a success closes
+    the circuit again, a failure re-opens it for another cool-down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failure_count = 0
+        self._opened_at: Optional[float] = None
+        self._half_open_in_flight = 0
+        self._total_failures = 0
+        self._total_rejections = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_state()
+            return self._state
+
+    def _refresh_state(self) -> None:
+        # Caller must hold the lock.
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._half_open_in_flight = 0
+            logger.info(f"Circuit '{self.name}' half-open, allowing trial calls")
+
+    def _retry_after(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._half_open_in_flight = 0
+        self._times_opened += 1
+        logger.warning(
+            f"Circuit '{self.name}' opened after {self._failure_count} failures; "
+            f"cooling down for {self.recovery_timeout}s"
+        )
+
+    def before_call(self) -> None:
+        """Reserve a call slot, raising CircuitOpenError if the call is not allowed."""
+        with self._lock:
+            self._refresh_state()
+            if self._state == OPEN:
+                self._total_rejections += 1
+                raise CircuitOpenError(self.name, self._retry_after())
+            if self._state == HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self._total_rejections += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._half_open_in_flight += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed after successful trial call")
+            self._state = CLOSED
+            self._failure_count = 0
+            self._opened_at = None
+            self._half_open_in_flight = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._total_failures += 1
+            self._refresh_state()
+            if self._state == OPEN:
+                # Late failures from calls that were in flight when the circuit
+                # opened must not push the cool-down back.
+                return
+            self._failure_count += 1
+            if self._state == HALF_OPEN or self._failure_count >= self.failure_threshold:
+                self._open()
+
+    def release(self) -> None:
+        """Give back a reserved call slot without recording an outcome."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_in_flight > 0:
+                self._half_open_in_flight -= 1
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await ``func`` through the breaker, recording its outcome."""
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about upstream health; just free the slot.
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failure_count = 0
+            self._opened_at = None
+            self._half_open_in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for health and metrics endpoints."""
+        with self._lock:
+            self._refresh_state()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failure_count,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout_seconds": self.recovery_timeout,
+                "retry_after_seconds": round(self._retry_after(), 3) if self._state == OPEN else 0.0,
+                "total_failures": self._total_failures,
+                "total_rejections": self._total_rejections,
+                "times_opened": self._times_opened,
+            }
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger("zulu-ai-api")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs past its deadline."""
+
+
+class ClientDisconnected(Exception):
+    """Raised when the HTTP client goes away before the work has finished."""
+
+
+class Deadline:
+    """Absolute per-request deadline that is passed down through generation."""
+
+    def __init__(self, timeout: Optional[float]):
+        self.timeout = timeout
+        self._expires_at = None if timeout is None else time.monotonic() + timeout
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None for no deadline."""
+        if self._expires_at is None:
+            return None
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+    def check(self, stage: str = "request") -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.timeout}s exceeded during {stage}")
+
+    async def run(self, awaitable: Awaitable[Any], stage: str = "request") -> Any:
+        """Await ``awaitable``, cancelling it if the deadline passes first."""
+        self.check(stage)
+        try:
+            return await asyncio.wait_for(awaitable, timeout=self.remaining())
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(f"Deadline of {self.timeout}s exceeded during {stage}")
+
+
+class DisconnectMiddleware:
+    """Pure ASGI middleware that records client disconnects on ``request.state``.
+
+    ``BaseHTTPMiddleware`` (``@app.middleware("http")``) hides the server's
+    ``http.disconnect`` message from the route once the body has been read, so
+    ``request.is_disconnected()`` never turns True behind it. Installed
+    outermost, this middleware watches the raw ``receive`` after the body is
+    complete and sets ``request.state.disconnected``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        disconnected = asyncio.Event()
+        scope.setdefault("state", {})["disconnected"] = disconnected
+        watcher: Optional[asyncio.Task] = None
+
+        async def watch() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        async def wrapped_receive():
+            nonlocal watcher
+            if watcher is None and not disconnected.is_set():
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                elif not message.get("more_body", False):
+                    # Body complete: from now on only a disconnect can arrive
+                    watcher = asyncio.ensure_future(watch())
+                return message
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        try:
+            await self.app(scope, wrapped_receive, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+
+async def _is_disconnected(request) -> bool:
+    disconnected = getattr(request.state, "disconnected", None)
+    if disconnected is not None:
+        return disconnected.is_set()
+    return await request.is_disconnected()
+
+
+async def cancel_on_disconnect(request, awaitable: Awaitable[Any], poll_interval: float = 0.5) -> Any:
+    """Run ``awaitable`` and cancel it as soon as the HTTP client disconnects.
+
+    Relies on ``DisconnectMiddleware`` when it is installed, otherwise falls
+    back to ``request.is_disconnected()``.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await _is_disconnected(request):
+                task.cancel()
+                logger.info(f"Client disconnected, cancelled request {getattr(request.state, 'request_id', None)}")
+                raise ClientDisconnected("Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
@@ -0,0 +1,31 @@
+import json
+import os
+from typing import Any, Dict
+
+GENERATED_ROOT = "generated"
+MANIFEST_FILE = "manifest.json"
+
+
+def manifest_path(app_dir: str) -> str:
+    return os.path.join(app_dir, MANIFEST_FILE)
+
+
+def read_manifest(app_dir: str) -> Dict[str, Any]:
+    """Load the manifest of a generated app, or an empty one if it has none."""
+    try:
+        with open(manifest_path(app_dir)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def update_manifest(app_dir: str, **fields: Any) -> Dict[str, Any]:
+    """Merge ``fields`` into the app manifest and write it back atomically."""
+    manifest = read_manifest(app_dir)
+    manifest.update(fields)
+    path = manifest_path(app_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+    return manifest
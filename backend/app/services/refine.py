@@ -0,0 +1,292 @@
+import asyncio
+import filecmp
+import os
+import re
+import shutil
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from slugify import slugify
+
+from backend.app.core.config import settings
+from backend.app.services.circuit_breaker import CircuitOpenError
+from backend.app.services.codegen import generate_with_gemini, new_generation_deadline
+from backend.app.services.deadline import Deadline
+from backend.app.services.manifest import GENERATED_ROOT, read_manifest, update_manifest
+from backend.app.services.tracing import span
+
+logger = logging.getLogger("zulu-ai-api")
+
+
+# Refinable files of a generated app, relative to its directory
+APP_FILES = {
+    "backend": os.path.join("backend", "main.py"),
+    "frontend": os.path.join("frontend", "App.js"),
+}
+
+_FRONTEND_HINTS = (
+    "ui", "button", "style", "css", "color", "colour", "layout", "page", "form",
+    "react", "component", "display", "show", "render", "font", "theme", "frontend",
+)
+_BACKEND_HINTS = (
+    "endpoint", "api", "route", "model", "database", "storage", "validation",
+    "fastapi", "pydantic", "server", "backend", "auth", "field", "query",
+)
+
+_EDIT_BLOCK = re.compile(
+    r"<<<<<<< SEARCH\n(.*?)\n?=======\n(.*?)\n?>>>>>>> REPLACE",
+    re.DOTALL
+)
+_BACKEND_ROUTE = re.compile(r"@app\.(get|post|put|patch|delete)\(\s*[\"']([^\"']+)")
+_FRONTEND_FETCH = re.compile(r"fetch\(\s*[`'\"]([^`'\"]+)")
+
+# Serialises refinements and regenerations of the same app within this process
+_app_locks: Dict[str, asyncio.Lock] = {}
+
+
+class AppNotFoundError(Exception):
+    """Raised when a slug does not match a generated app."""
+
+
+class PatchError(Exception):
+    """Raised when model output cannot be applied to the current file."""
+
+
+def app_lock(slug: str) -> asyncio.Lock:
+    """Lock held by anything that rewrites the files of ``slug``."""
+    return _app_locks.setdefault(slug, asyncio.Lock())
+
+
+def get_app_dir(slug: str) -> str:
+    """Resolve a slug to its generated app directory."""
+    if not slug or slugify(slug) != slug:
+        raise AppNotFoundError(f"Invalid app slug: {slug}")
+    app_dir = os.path.join(GENERATED_ROOT, slug)
+    if not os.path.isdir(app_dir):
+        raise AppNotFoundError(f"App '{slug}' not found")
+    return app_dir
+
+
+def pick_target(change_request: str) -> str:
+    """Guess which file a change request is about from its wording."""
+    words = re.findall(r"[a-z]+", change_request.lower())
+    frontend_score = sum(word in _FRONTEND_HINTS for word in words)
+    backend_score = sum(word in _BACKEND_HINTS for word in words)
+    return "frontend" if frontend_score > backend_score else "backend"
+
+
+def build_context(app_dir: str, target: str) -> str:
+    """Summarise the other file's API surface instead of sending it in full."""
+    if target == "frontend":
+        path = os.path.join(app_dir, APP_FILES["backend"])
+        pattern, label = _BACKEND_ROUTE, "Backend API routes"
+    else:
+        path = os.path.join(app_dir, APP_FILES["frontend"])
+        pattern, label = _FRONTEND_FETCH, "Frontend fetch calls"
+    try:
+        with open(path) as f:
+            source = f.read()
+    except FileNotFoundError:
+        return ""
+    matches = pattern.findall(source)
+    if target == "frontend":
+        entries = [f"{method.upper()} {route}" for method, route in matches]
+    else:
+        entries = matches
+    if not entries:
+        return ""
+    return f"{label}: {', '.join(dict.fromkeys(entries))}"
+
+
+def parse_edit_blocks(output: str) -> List[Tuple[str, str]]:
+    """Extract (search, replace) pairs from model output."""
+    blocks = _EDIT_BLOCK.findall(output.replace("\r\n", "\n"))
+    if not blocks:
+        raise PatchError("Model response did not contain any edit blocks")
+    return blocks
+
+
+def apply_edit_blocks(content: str, blocks: List[Tuple[str, str]]) -> str:
+    """Apply edit blocks in order; an empty SEARCH appends to the file."""
+    for search, replace in blocks:
+        if not search:
+            content = content.rstrip("\n") + "\n" + replace + "\n"
+            continue
+        if search not in content:
+            raise PatchError(f"Edit block does not match the current file: {search.splitlines()[0]!r}")
+        content = content.replace(search, replace, 1)
+    return content
+
+
+def build_refine_prompt(slug: str, target: str, content: str, change_request: str, context: str) -> str:
+    language = "Python (FastAPI)" if target == "backend" else "JavaScript (React)"
+    return f'''You are an expert {language} developer refining the existing {APP_FILES[target]} of a "{slug.replace("-", " ")}" app.
+Change request: {change_request}
+{context}
+Current file:
+{content}
+
+Reply ONLY with one or more edit blocks in exactly this format, where the SEARCH text is copied verbatim from the current file and is as short as possible while still unique:
+<<<<<<< SEARCH
+existing lines
+=======
+replacement lines
+>>>>>>> REPLACE
+Do not include explanations or markdown code blocks.'''
+
+
+def mock_edit_blocks(target: str, content: str, change_request: str) -> str:
+    """Deterministic edit used in mock mode: annotate the file with the request."""
+    comment = "#" if target == "backend" else "//"
+    # Collapse whitespace so a multi-line request cannot escape the comment
+    note = f"{comment} Requested change: {' '.join(change_request.split())}"
+    first_line = content.split("\n", 1)[0]
+    if not first_line:
+        return f"<<<<<<< SEARCH\n=======\n{note}\n>>>>>>> REPLACE"
+    return f"<<<<<<< SEARCH\n{first_line}\n=======\n{note}\n{first_line}\n>>>>>>> REPLACE"
+
+
+def _snapshot(app_dir: str, version: int, targets: List[str]) -> Dict[str, str]:
+    paths = {}
+    for target in targets:
+        source = os.path.join(app_dir, APP_FILES[target])
+        if not os.path.isfile(source):
+            continue
+        relative = os.path.join("versions", f"v{version}", APP_FILES[target])
+        os.makedirs(os.path.dirname(os.path.join(app_dir, relative)), exist_ok=True)
+        shutil.copyfile(source, os.path.join(app_dir, relative))
+        paths[target] = relative
+    return paths
+
+
+def _generation_entry(app_dir: str, version: int) -> Dict:
+    return {
+        "version": version,
+        "change_request": None,
+        "files": _snapshot(app_dir, version, list(APP_FILES)),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mode": "generate",
+    }
+
+
+def _ensure_history(app_dir: str) -> List[Dict]:
+    """Return the version history, snapshotting the original files on first use."""
+    versions = read_manifest(app_dir).get("versions", [])
+    if not versions:
+        # Keep the original generation so the first refinement can be undone
+        versions.append(_generation_entry(app_dir, 1))
+    return versions
+
+
+def _latest_snapshot(versions: List[Dict], target: str) -> Optional[str]:
+    for entry in reversed(versions):
+        if target in entry["files"]:
+            return entry["files"][target]
+    return None
+
+
+def _matches_history(app_dir: str, versions: List[Dict]) -> bool:
+    """True if every app file is identical to its most recent snapshot."""
+    for target, relative in APP_FILES.items():
+        source = os.path.join(app_dir, relative)
+        snapshot = _latest_snapshot(versions, target)
+        if not os.path.isfile(source):
+            if snapshot is not None:
+                return False
+            continue
+        if snapshot is None or not filecmp.cmp(source, os.path.join(app_dir, snapshot), shallow=False):
+            return False
+    return True
+
+
+def record_generation(app_dir: str) -> Optional[int]:
+    """Append a full snapshot after an app with version history is regenerated.
+
+    Without it, refinements after a regeneration would be recorded on top of
+    the snapshots of the previous generation. Apps that were never refined
+    get their first snapshot lazily from ``_ensure_history``, and identical
+    regenerations are skipped, so repeated generation does not grow the
+    history. Returns the new version, or None if nothing was recorded.
+    """
+    versions = read_manifest(app_dir).get("versions", [])
+    if not versions or _matches_history(app_dir, versions):
+        return None
+    version = versions[-1]["version"] + 1
+    versions.append(_generation_entry(app_dir, version))
+    update_manifest(app_dir, versions=versions)
+    return version
+
+
+def _record_version(app_dir: str, versions: List[Dict], target: str, change_request: str, mode: str) -> int:
+    """Snapshot the refined file and append it to the manifest's version history."""
+    version = versions[-1]["version"] + 1
+    versions.append({
+        "version": version,
+        "change_request": change_request,
+        "files": _snapshot(app_dir, version, [target]),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "mode": mode,
+    })
+    update_manifest(app_dir, versions=versions)
+    return version
+
+
+def list_versions(slug: str) -> List[Dict]:
+    return read_manifest(get_app_dir(slug)).get("versions", [])
+
+
+async def refine_app(
+    slug: str,
+    change_request: str,
+    target: Optional[str] = None,
+    deadline: Optional[Deadline] = None,
+) -> Dict:
+    """Apply a change request to one file of a generated app as a patch."""
+    app_dir = get_app_dir(slug)
+    target = target or pick_target(change_request)
+    if target not in APP_FILES:
+        raise ValueError(f"Target must be one of: {', '.join(APP_FILES)}")
+    file_path = os.path.join(app_dir, APP_FILES[target])
+    if not os.path.isfile(file_path):
+        raise AppNotFoundError(f"App '{slug}' has no {APP_FILES[target]}")
+
+    async with app_lock(slug):
+        with open(file_path) as f:
+            content = f.read()
+
+        mode = "live" if settings.ai_mode.lower() == "live" else "mock"
+        if mode == "live":
+            with span("prompt"):
+                prompt = build_refine_prompt(
+                    slug, target, content, change_request, build_context(app_dir, target)
+                )
+            try:
+                with span("gemini_refine"):
+                    output = await generate_with_gemini(prompt, deadline or new_generation_deadline())
+            except CircuitOpenError as e:
+                if settings.gemini_breaker_policy != "fallback":
+                    raise
+                logger.warning(f"{e}. Falling back to mock refinement.")
+                mode = "mock"
+        if mode == "mock":
+            output = mock_edit_blocks(target, content, change_request)
+
+        with span("patch"):
+            blocks = parse_edit_blocks(output)
+            patched = apply_edit_blocks(content, blocks)
+
+        with span("write"):
+            versions = _ensure_history(app_dir)
+            with open(file_path, "w") as f:
+                f.write(patched)
+            version = _record_version(app_dir, versions, target, change_request, mode)
+
+    return {
+        "slug": slug,
+        "file": file_path,
+        "target": target,
+        "version": version,
+        "blocks_applied": len(blocks),
+        "mode": mode,
+    }
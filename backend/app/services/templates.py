@@ -0,0 +1,67 @@
+import os
+import re
+from typing import Dict, List, Tuple
+
+TEMPLATE_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates", "mock")
+
+# Template file for each generated file, relative to a variant directory
+TEMPLATE_FILES = {
+    "backend": "main.py.tmpl",
+    "frontend": "App.js.tmpl",
+}
+
+# Only known names are placeholders, so JSX like style={{ ... }} is left alone
+_PLACEHOLDER = re.compile(r"\{\{\s*(title|idea|slug)\s*\}\}")
+
+
+class CompiledTemplate:
+    """A template split once into literal chunks and placeholder names."""
+
+    __slots__ = ("_parts",)
+
+    def __init__(self, source: str):
+        parts: List[Tuple[bool, str]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            if match.start() > position:
+                parts.append((False, source[position:match.start()]))
+            parts.append((True, match.group(1)))
+            position = match.end()
+        if position < len(source):
+            parts.append((False, source[position:]))
+        self._parts = tuple(parts)
+
+    def render(self, values: Dict[str, str]) -> str:
+        return "".join(values[text] if is_name else text for is_name, text in self._parts)
+
+
+class MockTemplateEngine:
+    """Loads and compiles every mock template variant once."""
+
+    def __init__(self, root: str = TEMPLATE_ROOT):
+        self._variants: Dict[str, Dict[str, CompiledTemplate]] = {}
+        for variant in sorted(os.listdir(root)):
+            variant_dir = os.path.join(root, variant)
+            if not os.path.isdir(variant_dir):
+                continue
+            compiled = {}
+            for kind, filename in TEMPLATE_FILES.items():
+                with open(os.path.join(variant_dir, filename)) as f:
+                    compiled[kind] = CompiledTemplate(f.read())
+            self._variants[variant] = compiled
+
+    @property
+    def variants(self) -> List[str]:
+        return list(self._variants)
+
+    def render(self, variant: str, idea: str, slug: str) -> Dict[str, str]:
+        """Render the backend and frontend sources of ``variant`` for ``idea``."""
+        templates = self._variants.get(variant)
+        if templates is None:
+            raise ValueError(f"Unknown mock template '{variant}'. Available: {', '.join(self._variants)}")
+        values = {"title": idea.title(), "idea": idea, "slug": slug}
+        return {kind: template.render(values) for kind, template in templates.items()}
+
+
+# Compiled once at import, i.e. at application startup
+engine = MockTemplateEngine()
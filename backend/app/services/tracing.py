@@ -0,0 +1,189 @@
+import json
+import queue
+import time
+import threading
+import contextvars
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger("zulu-ai-api")
+
+
+class Span:
+    """A single timed stage of a request."""
+
+    __slots__ = ("name", "request_id", "start", "duration_ms", "attributes")
+
+    def __init__(self, name: str, request_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.request_id = request_id
+        self.start = time.time()
+        self.duration_ms = 0.0
+        self.attributes = attributes
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "request_id": self.request_id,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+        }
+
+
+class RequestTrace:
+    """Spans collected for one HTTP request."""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.spans: List[Span] = []
+
+    def server_timing(self) -> str:
+        """Render the spans as a ``Server-Timing`` header value."""
+        return ", ".join(f"{span.name};dur={span.duration_ms:.1f}" for span in self.spans)
+
+
+class InMemoryExporter:
+    """Keeps the most recent spans in a ring buffer for the debug endpoint."""
+
+    def __init__(self, capacity: int = 1000):
+        self._spans = deque(maxlen=capacity)
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span.to_dict())
+
+    def recent(self, request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        spans = list(self._spans)
+        if request_id:
+            spans = [span for span in spans if span["request_id"] == request_id]
+        return spans
+
+
+class JsonLinesExporter:
+    """Appends spans as JSON lines from a background thread.
+
+    ``export`` only enqueues, so no disk I/O happens on the event loop. The
+    writer thread drains the queue and writes each batch with one call.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        self._queue.put(span.to_dict())
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [record for record in batch if record is not None]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in batch))
+        except OSError as e:
+            logger.error(f"Failed to write spans to {self.path}: {e}")
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending spans and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def recent(self, request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return []
+
+
+class NullExporter:
+    """Drops spans; Server-Timing headers are still emitted."""
+
+    def export(self, span: Span) -> None:
+        pass
+
+    def recent(self, request_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        return []
+
+
+def _build_exporter():
+    if settings.trace_exporter == "jsonl":
+        return JsonLinesExporter(settings.trace_file)
+    if settings.trace_exporter == "none":
+        return NullExporter()
+    return InMemoryExporter(settings.trace_buffer_size)
+
+
+_exporter = _build_exporter()
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+
+def get_exporter():
+    return _exporter
+
+
+def set_exporter(exporter) -> None:
+    """Swap the span exporter (anything with ``export`` and ``recent``)."""
+    global _exporter
+    _exporter = exporter
+
+
+@contextmanager
+def start_trace(request_id: str) -> Iterator[RequestTrace]:
+    """Collect spans for the current request until the block exits."""
+    trace = RequestTrace(request_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def shutdown_exporter() -> None:
+    """Flush exporters that buffer spans, e.g. on application shutdown."""
+    close = getattr(_exporter, "close", None)
+    if close is not None:
+        close()
+
+
+@contextmanager
+def span(name: str, exported: bool = True, **attributes: Any) -> Iterator[Span]:
+    """Time a stage of the current request and hand it to the exporter.
+
+    With ``exported=False`` the span only feeds the Server-Timing header.
+    """
+    trace = _current_trace.get()
+    current = Span(name, trace.request_id if trace else None, attributes)
+    started = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        if trace is not None:
+            trace.spans.append(current)
+        if exported:
+            try:
+                _exporter.export(current)
+            except Exception as e:
+                logger.error(f"Failed to export span {name}: {e}")
@@ -0,0 +1,289 @@
+"""Smoke tests for generated FastAPI backends.
+
+Each app is imported in a worker process from a pool (a worker that exceeds
+the per-app timeout is killed and replaced), its parameter-free GET
+routes are called with an in-process test client, and the outcome is stored
+under ``verification`` in the app manifest.
+
+Run over the whole ``generated/`` directory with::
+
+    python -m backend.app.services.verify --workers 8
+"""
+import argparse
+import asyncio
+import importlib.util
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.app.core.config import settings
+from backend.app.services.manifest import GENERATED_ROOT, update_manifest
+
+logger = logging.getLogger("zulu-ai-api")
+
+BACKEND_ENTRYPOINT = os.path.join("backend", "main.py")
+
+# Seconds allowed on top of VERIFY_TIMEOUT for spawning a worker process
+VERIFY_STARTUP_GRACE = 10.0
+
+# Bounds concurrent post-generation checks to VERIFY_WORKERS processes
+_verify_slots = threading.BoundedSemaphore(settings.verify_workers)
+
+
+def discover_apps(root: str = GENERATED_ROOT) -> List[str]:
+    """Return every app directory under ``root`` that has a generated backend."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(
+        entry.path
+        for entry in os.scandir(root)
+        if entry.is_dir() and os.path.isfile(os.path.join(entry.path, BACKEND_ENTRYPOINT))
+    )
+
+
+def _load_fastapi_app(app_dir: str):
+    backend_dir = os.path.abspath(os.path.join(app_dir, "backend"))
+    module_name = "generated_" + os.path.basename(os.path.normpath(app_dir)).replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(backend_dir, "main.py"))
+    module = importlib.util.module_from_spec(spec)
+    # Let the generated code import its own sibling modules
+    sys.path.insert(0, backend_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(backend_dir)
+    app = getattr(module, "app", None)
+    if app is None:
+        raise ValueError("backend/main.py does not define `app`")
+    return app
+
+
+def _get_routes(app) -> List[str]:
+    """GET routes that can be called without path parameters."""
+    return [
+        route.path
+        for route in getattr(app, "routes", [])
+        if "GET" in (getattr(route, "methods", None) or ())
+        and "{" not in route.path
+        and route.path not in ("/docs", "/redoc", "/openapi.json", "/docs/oauth2-redirect")
+    ]
+
+
+def _new_result(app_dir: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "slug": os.path.basename(os.path.normpath(app_dir)),
+        "passed": False,
+        "error": error,
+        "import_ms": None,
+        "routes": [],
+        "verified_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def smoke_test_app(app_dir: str, write_manifest: bool = True) -> Dict[str, Any]:
+    """Import one generated backend, hit its GET routes and record the result."""
+    from fastapi.testclient import TestClient
+
+    result = _new_result(app_dir)
+    try:
+        started = time.perf_counter()
+        app = _load_fastapi_app(app_dir)
+        result["import_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+        with TestClient(app, raise_server_exceptions=False) as client:
+            for path in _get_routes(app):
+                started = time.perf_counter()
+                response = client.get(path)
+                result["routes"].append({
+                    "path": path,
+                    "status_code": response.status_code,
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                    # 4xx usually means the route wants input we did not send
+                    "passed": response.status_code < 500,
+                })
+        if not result["routes"]:
+            result["error"] = "No GET routes to call"
+        result["passed"] = bool(result["routes"]) and all(r["passed"] for r in result["routes"])
+    except BaseException as e:
+        # SystemExit and friends from generated code must not kill the worker
+        result["error"] = f"{type(e).__name__}: {e}"
+
+    if write_manifest:
+        update_manifest(app_dir, verification=result)
+    return result
+
+
+def _worker_loop(conn) -> None:
+    """Worker process: smoke test app directories received over ``conn``."""
+    while True:
+        app_dir = conn.recv()
+        if app_dir is None:
+            break
+        conn.send(smoke_test_app(app_dir, write_manifest=False))
+
+
+class _Worker:
+    """One smoke-test process that can be killed when an app hangs."""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.app_dir: Optional[str] = None
+        self.started = 0.0
+        self.tasks = 0
+
+    def assign(self, app_dir: str) -> None:
+        self.app_dir = app_dir
+        self.started = time.monotonic()
+        self.tasks += 1
+        self.conn.send(app_dir)
+
+    def stop(self) -> None:
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def verify_apps(
+    app_dirs: Iterable[str],
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    max_tasks_per_child: int = 20,
+) -> List[Dict[str, Any]]:
+    """Smoke test ``app_dirs`` across a pool of worker processes.
+
+    An app that runs longer than ``timeout`` seconds has its worker killed
+    and replaced, and is recorded with ``error="timeout"``.
+    """
+    pending = deque(app_dirs)
+    if not pending:
+        return []
+    timeout = settings.verify_timeout if timeout is None else timeout
+    ctx = multiprocessing.get_context("spawn")
+    idle = [_Worker(ctx) for _ in range(min(workers or os.cpu_count() or 1, len(pending)))]
+    busy: List[_Worker] = []
+    results = []
+    try:
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                worker.assign(pending.popleft())
+                busy.append(worker)
+
+            ready = wait([worker.conn for worker in busy], timeout=0.1)
+            now = time.monotonic()
+            for worker in list(busy):
+                reusable = True
+                if worker.conn in ready:
+                    try:
+                        result = worker.conn.recv()
+                    except (EOFError, OSError):
+                        # The worker died (e.g. os._exit in generated code)
+                        worker.process.join()
+                        result = _new_result(
+                            worker.app_dir, error=f"Worker crashed (exit code {worker.process.exitcode})"
+                        )
+                        reusable = False
+                elif timeout and now - worker.started > timeout:
+                    result = _new_result(worker.app_dir, error="timeout")
+                    reusable = False
+                else:
+                    continue
+
+                busy.remove(worker)
+                update_manifest(worker.app_dir, verification=result)
+                results.append(result)
+                # Recycle workers so state leaked by generated code cannot pile up
+                if reusable and worker.tasks < max_tasks_per_child:
+                    idle.append(worker)
+                    continue
+                if reusable:
+                    worker.stop()
+                else:
+                    worker.kill()
+                if pending:
+                    idle.append(_Worker(ctx))
+    finally:
+        for worker in idle:
+            worker.stop()
+        for worker in busy:
+            worker.kill()
+    return sorted(results, key=lambda r: r["slug"])
+
+
+def _verify_one(app_dir: str) -> Dict[str, Any]:
+    if not _verify_slots.acquire(timeout=settings.verify_timeout):
+        return _new_result(app_dir, error="timeout")
+    try:
+        return verify_apps([app_dir], workers=1)[0]
+    finally:
+        _verify_slots.release()
+
+
+async def verify_generated_app(backend_file: str) -> Dict[str, Any]:
+    """Post-generation step: smoke test a freshly written app out of process."""
+    app_dir = os.path.dirname(os.path.dirname(backend_file))
+    try:
+        # Leave room for spawning the worker on top of the smoke test itself
+        return await asyncio.wait_for(
+            asyncio.to_thread(_verify_one, app_dir),
+            timeout=settings.verify_timeout + VERIFY_STARTUP_GRACE
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"Verification of {app_dir} timed out")
+        return _new_result(app_dir, error="timeout")
+    except Exception as e:
+        # Verification is advisory; never fail the generation because of it
+        logger.error(f"Verification of {app_dir} failed: {e}")
+        return _new_result(app_dir, error=f"Verification failed to run: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Smoke test generated FastAPI backends.")
+    parser.add_argument("slugs", nargs="*", help="Apps to verify (default: all)")
+    parser.add_argument("--root", default=GENERATED_ROOT, help="Directory holding generated apps")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds per app (default: VERIFY_TIMEOUT)")
+    args = parser.parse_args(argv)
+
+    if args.slugs:
+        app_dirs = [os.path.join(args.root, slug) for slug in args.slugs]
+    else:
+        app_dirs = discover_apps(args.root)
+
+    started = time.perf_counter()
+    results = verify_apps(app_dirs, workers=args.workers, timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        status = "PASS" if result["passed"] else "FAIL"
+        detail = result["error"] or ", ".join(
+            f"{r['path']} {r['status_code']} {r['latency_ms']}ms" for r in result["routes"]
+        )
+        print(f"{status} {result['slug']}: {detail}")
+    failed = sum(1 for r in results if not r["passed"])
+    print(f"{len(results) - failed}/{len(results)} apps passed in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Micro-benchmark of response serialization cost.
+
+Compares the old path for untyped routes (``jsonable_encoder`` followed by
+``json.dumps``) with the typed path FastAPI takes when a route declares a
+Pydantic response model (validate, then ``dump_json`` in pydantic-core).
+
+Run from the repository root::
+
+    python -m backend.benchmarks.serialization
+"""
+import json
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from backend.app.models.generation_models import GeneratedFiles, GenerationResponse
+from backend.app.models.health_models import CircuitBreakerState, HealthResponse, StatusResponse
+from backend.app.services.codegen import gemini_breaker, render_mock_app
+
+
+def _legacy(payload: dict) -> bytes:
+    return json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _typed(adapter: TypeAdapter, model) -> bytes:
+    return adapter.dump_json(adapter.validate_python(model))
+
+
+def _cases():
+    circuit = gemini_breaker.snapshot()
+    health = HealthResponse(
+        status="healthy",
+        app_name="Zulu AI API",
+        ai_mode="mock",
+        gemini_configured=False,
+        live_mode=False,
+        gemini_circuit=CircuitBreakerState(**circuit),
+    )
+    status = StatusResponse(
+        status="healthy",
+        app_name="Zulu AI API",
+        ai_mode="mock",
+        gemini_configured=False,
+        live_mode=False,
+        docs_url="/docs",
+        redoc_url="/redoc",
+    )
+    contents = render_mock_app("a collaborative task manager", "crud")
+    generation = GenerationResponse(
+        message="Mock app generated successfully!",
+        files=GeneratedFiles(**contents),
+        mode="mock",
+    )
+    return [
+        ("health", health, HealthResponse),
+        ("status", status, StatusResponse),
+        ("generation (write-less)", generation, GenerationResponse),
+    ]
+
+
+def main(number: int = 20000) -> None:
+    print(f"{'payload':<26}{'bytes':>8}{'legacy us':>12}{'typed us':>12}{'speedup':>10}")
+    for name, model, model_type in _cases():
+        adapter = TypeAdapter(model_type)
+        payload = model.model_dump(exclude_unset=True)
+        body = _typed(adapter, model)
+        legacy = min(timeit.repeat(lambda: _legacy(payload), number=number, repeat=3)) / number * 1e6
+        typed = min(timeit.repeat(lambda: _typed(adapter, model), number=number, repeat=3)) / number * 1e6
+        print(f"{name:<26}{len(body):>8}{legacy:>12.2f}{typed:>12.2f}{legacy / typed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
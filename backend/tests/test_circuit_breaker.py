@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.app.services.codegen import gemini_breaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def _fail():
+    raise RuntimeError("upstream down")
+
+
+async def _ok():
+    return "ok"
+
+
+def test_breaker_opens_after_threshold_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            asyncio.run(breaker.call(_fail))
+    assert breaker.state == "open"
+
+    # Open circuit rejects without calling upstream
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(breaker.call(_ok))
+
+    clock.now = 10
+    assert breaker.state == "half_open"
+    assert asyncio.run(breaker.call(_ok)) == "ok"
+    assert breaker.state == "closed"
+
+
+def test_failed_trial_call_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=5, clock=clock)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(breaker.call(_fail))
+    clock.now = 5
+    with pytest.raises(RuntimeError):
+        asyncio.run(breaker.call(_fail))
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "open"
+    assert snapshot["times_opened"] == 2
+
+
+def test_late_failures_do_not_extend_cool_down():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=30, clock=clock)
+
+    # Five calls are in flight before any of them fails
+    for _ in range(5):
+        breaker.before_call()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 25
+    for _ in range(3):
+        breaker.record_failure()
+    snapshot = breaker.snapshot()
+    assert snapshot["times_opened"] == 1
+    assert snapshot["retry_after_seconds"] == 5
+
+    clock.now = 30
+    assert breaker.state == "half_open"
+
+
+def test_open_circuit_fallback_is_reported_as_mock(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ai_mode", "live")
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(settings, "gemini_breaker_policy", "fallback")
+    for _ in range(gemini_breaker.failure_threshold):
+        gemini_breaker.record_failure()
+    try:
+        response = TestClient(app).post("/api/v1/generate_app", json={"idea": "todo list"})
+    finally:
+        gemini_breaker.reset()
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["mode"] == "mock"
+    assert "fell back" in data["message"]
+    assert (tmp_path / "generated" / "todo-list" / "backend" / "main.py").exists()
+
+
+if __name__ == "__main__":
+    test_breaker_opens_after_threshold_and_recovers()
+    test_failed_trial_call_reopens_circuit()
+    test_late_failures_do_not_extend_cool_down()
+    import pathlib, tempfile
+    test_open_circuit_fallback_is_reported_as_mock(pathlib.Path(tempfile.mkdtemp()), pytest.MonkeyPatch())
+    print("Circuit breaker tests passed.")
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import pytest
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.services import codegen
+from backend.app.services.deadline import Deadline, DeadlineExceeded
+
+
+def test_deadline_cancels_slow_work():
+    async def scenario():
+        deadline = Deadline(0.05)
+        with pytest.raises(DeadlineExceeded):
+            await deadline.run(asyncio.sleep(1), stage="test")
+        assert deadline.expired
+
+    asyncio.run(scenario())
+
+
+def test_work_is_cancelled_when_client_disconnects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ai_mode", "live")
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    state = {"cancelled": False}
+
+    async def slow_generation(prompt, deadline=None):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return ""
+
+    monkeypatch.setattr(codegen, "generate_with_gemini", slow_generation)
+
+    async def scenario():
+        body = json.dumps({"idea": "slow app"}).encode()
+        messages = asyncio.Queue()
+        await messages.put({"type": "http.request", "body": body, "more_body": False})
+        sent = []
+
+        async def receive():
+            return await messages.get()
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/v1/generate_app",
+            "raw_path": b"/api/v1/generate_app",
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            "client": ("127.0.0.1", 12345),
+            "server": ("testserver", 80),
+        }
+        request = asyncio.ensure_future(app(scope, receive, send))
+        # The client gives up while generation is still running
+        await asyncio.sleep(0.2)
+        await messages.put({"type": "http.disconnect"})
+        await asyncio.wait_for(request, timeout=3)
+        return sent
+
+    sent = asyncio.run(scenario())
+    assert state["cancelled"]
+    assert sent[0]["status"] == 499
+
+
+if __name__ == "__main__":
+    test_deadline_cancels_slow_work()
+    import pathlib, tempfile
+    test_work_is_cancelled_when_client_disconnects(pathlib.Path(tempfile.mkdtemp()), pytest.MonkeyPatch())
+    print("Deadline tests passed.")
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
-from app.main import app
+from backend.app.main import app
+
 
 def test_status_endpoint():
     client = TestClient(app)
@@ -11,6 +12,17 @@ def test_status_endpoint():
     assert "gemini_configured" in data
     assert "live_mode" in data
 
+
+def test_health_endpoint():
+    client = TestClient(app)
+    response = client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "healthy"
+    assert data["gemini_circuit"]["state"] in ("closed", "open", "half_open")
+
+
 if __name__ == "__main__":
     test_status_endpoint()
-    print("/status endpoint test passed.")
\ No newline at end of file
+    test_health_endpoint()
+    print("/status and /health endpoint tests passed.")
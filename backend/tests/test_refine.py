@@ -0,0 +1,163 @@
+import asyncio
+import httpx
+import os
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.services import codegen, refine
+from backend.app.services.refine import (
+    PatchError,
+    apply_edit_blocks,
+    mock_edit_blocks,
+    parse_edit_blocks,
+    pick_target,
+)
+
+BACKEND = '''from fastapi import FastAPI
+
+app = FastAPI()
+
+@app.get("/items")
+async def get_items():
+    return {"items": []}
+'''
+
+
+def test_edit_blocks_apply_as_patch():
+    output = '''<<<<<<< SEARCH
+    return {"items": []}
+=======
+    return {"items": ["a"]}
+>>>>>>> REPLACE'''
+    patched = apply_edit_blocks(BACKEND, parse_edit_blocks(output))
+    assert '{"items": ["a"]}' in patched
+    assert patched.startswith("from fastapi import FastAPI")
+
+    with pytest.raises(PatchError):
+        apply_edit_blocks(BACKEND, [("not in file", "x")])
+
+
+def test_pick_target():
+    assert pick_target("Make the submit button blue") == "frontend"
+    assert pick_target("Add a POST endpoint for comments") == "backend"
+
+
+def test_mock_edit_keeps_request_in_comment():
+    output = mock_edit_blocks("backend", BACKEND, "add a comment\nimport nonexistent_mod")
+    patched = apply_edit_blocks(BACKEND, parse_edit_blocks(output))
+    assert patched.split("\n", 1)[0] == "# Requested change: add a comment import nonexistent_mod"
+    assert "\nimport nonexistent_mod" not in patched
+    compile(patched, "main.py", "exec")
+
+
+def test_refine_endpoint_records_versions(tmp_path, monkeypatch):
+    (tmp_path / "todo-app" / "backend").mkdir(parents=True)
+    (tmp_path / "todo-app" / "backend" / "main.py").write_text(BACKEND)
+    monkeypatch.setattr(refine, "GENERATED_ROOT", str(tmp_path))
+    monkeypatch.setattr(settings, "ai_mode", "mock")
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/apps/todo-app/refine",
+        json={"change_request": "Add a DELETE endpoint", "target": "backend"}
+    )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    assert "Requested change: Add a DELETE endpoint" in (tmp_path / "todo-app" / "backend" / "main.py").read_text()
+    assert (tmp_path / "todo-app" / "versions" / "v1" / "backend" / "main.py").read_text() == BACKEND
+
+    versions = client.get("/api/v1/apps/todo-app/versions").json()["versions"]
+    assert [v["version"] for v in versions] == [1, 2]
+    assert client.post("/api/v1/apps/missing/refine", json={"change_request": "x"}).status_code == 404
+
+
+def test_regeneration_starts_new_history_entry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ai_mode", "mock")
+    client = TestClient(app)
+    generate = {"idea": "todo app", "write_files": True}
+    refine_backend = {"change_request": "Add a DELETE endpoint", "target": "backend"}
+    backend_file = tmp_path / "generated" / "todo-app" / "backend" / "main.py"
+
+    assert client.post("/api/v1/generate_app", json=generate).status_code == 200
+    assert client.post("/api/v1/apps/todo-app/refine", json=refine_backend).json()["version"] == 2
+    assert client.post("/api/v1/generate_app", json=generate).status_code == 200
+    regenerated = backend_file.read_text()
+    assert client.post("/api/v1/apps/todo-app/refine", json=refine_backend).json()["version"] == 4
+
+    versions = client.get("/api/v1/apps/todo-app/versions").json()["versions"]
+    assert [(v["version"], v["mode"]) for v in versions] == [
+        (1, "generate"), (2, "mock"), (3, "generate"), (4, "mock")
+    ]
+    # The snapshot of the regeneration holds the fresh output, not the refined file
+    v3 = tmp_path / "generated" / "todo-app" / versions[2]["files"]["backend"]
+    assert v3.read_text() == regenerated
+    assert backend_file.read_text().count("Requested change") == 1
+
+
+def test_identical_generations_do_not_grow_history(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ai_mode", "mock")
+    client = TestClient(app)
+    generate = {"idea": "todo app", "write_files": True}
+    app_dir = tmp_path / "generated" / "todo-app"
+
+    for _ in range(3):
+        assert client.post("/api/v1/generate_app", json=generate).status_code == 200
+    # Never refined: no snapshots are taken at all
+    assert not (app_dir / "versions").exists()
+
+    client.post("/api/v1/apps/todo-app/refine", json={"change_request": "Add a DELETE endpoint"})
+    for _ in range(3):
+        assert client.post("/api/v1/generate_app", json=generate).status_code == 200
+    versions = client.get("/api/v1/apps/todo-app/versions").json()["versions"]
+    assert [(v["version"], v["mode"]) for v in versions] == [(1, "generate"), (2, "mock"), (3, "generate")]
+    assert sorted(os.listdir(app_dir / "versions")) == ["v1", "v2", "v3"]
+
+
+def test_regeneration_waits_for_refine_in_flight(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "ai_mode", "mock")
+    client = TestClient(app)
+    client.post("/api/v1/generate_app", json={"idea": "todo app", "write_files": True})
+    client.post("/api/v1/apps/todo-app/refine", json={"change_request": "Add a DELETE endpoint", "target": "backend"})
+    backend_file = tmp_path / "generated" / "todo-app" / "backend" / "main.py"
+    first_line = backend_file.read_text().split("\n", 1)[0]
+    regenerated = "# regenerated\nfrom fastapi import FastAPI\napp = FastAPI()"
+
+    async def slow_refine(prompt, deadline=None):
+        await asyncio.sleep(0.3)
+        return f"<<<<<<< SEARCH\n{first_line}\n=======\n# refined\n{first_line}\n>>>>>>> REPLACE"
+
+    async def fast_generation(prompt, deadline=None):
+        return regenerated if "FastAPI backend" in prompt else "// regenerated\nexport default App;"
+
+    monkeypatch.setattr(settings, "ai_mode", "live")
+    monkeypatch.setattr(settings, "gemini_api_key", "test-key")
+    monkeypatch.setattr(refine, "generate_with_gemini", slow_refine)
+    monkeypatch.setattr(codegen, "generate_with_gemini", fast_generation)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+            refining = asyncio.ensure_future(async_client.post(
+                "/api/v1/apps/todo-app/refine", json={"change_request": "Add a comment", "target": "backend"}
+            ))
+            # Regenerate while the refine is waiting on Gemini
+            await asyncio.sleep(0.1)
+            generated = await async_client.post("/api/v1/generate_app", json={"idea": "todo app"})
+            return (await refining).status_code, generated.status_code
+
+    assert asyncio.run(scenario()) == (200, 200)
+    # The regeneration lands after the refine instead of being patched over
+    assert backend_file.read_text() == regenerated
+    versions = client.get("/api/v1/apps/todo-app/versions").json()["versions"]
+    assert [v["mode"] for v in versions] == ["generate", "mock", "live", "generate"]
+
+
+if __name__ == "__main__":
+    test_edit_blocks_apply_as_patch()
+    test_pick_target()
+    test_mock_edit_keeps_request_in_comment()
+    print("Refine tests passed.")
@@ -0,0 +1,40 @@
+import pytest
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.core.config import settings
+from backend.app.services.templates import CompiledTemplate, engine
+
+
+def test_compiled_template_leaves_jsx_braces_alone():
+    template = CompiledTemplate('<h1 style={{ color: "red" }}>{{title}}</h1>{{ idea }}')
+    assert template.render({"title": "Todo", "idea": "todo"}) == '<h1 style={{ color: "red" }}>Todo</h1>todo'
+
+
+def test_all_variants_render():
+    assert {"basic", "crud", "minimal"} <= set(engine.variants)
+    for variant in engine.variants:
+        files = engine.render(variant, "todo list", "todo-list")
+        assert "Todo List API" in files["backend"]
+        assert "{{" not in files["backend"]
+    with pytest.raises(ValueError):
+        engine.render("missing", "todo list", "todo-list")
+
+
+def test_write_less_mock_mode(monkeypatch):
+    monkeypatch.setattr(settings, "ai_mode", "mock")
+    client = TestClient(app)
+    response = client.post(
+        "/api/v1/generate_app",
+        json={"idea": "todo list", "template": "crud", "write_files": False}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert "generated_files" not in data
+    assert "@app.post(\"/items\"" in data["files"]["backend"]
+
+
+if __name__ == "__main__":
+    test_compiled_template_leaves_jsx_braces_alone()
+    test_all_variants_render()
+    test_write_less_mock_mode(pytest.MonkeyPatch())
+    print("Template tests passed.")
@@ -0,0 +1,60 @@
+import json
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.services import tracing
+
+
+def test_spans_are_recorded_per_request():
+    exporter = tracing.InMemoryExporter(capacity=10)
+    previous = tracing.get_exporter()
+    tracing.set_exporter(exporter)
+    try:
+        with tracing.start_trace("req-1") as trace:
+            with tracing.span("prompt"):
+                pass
+            with tracing.span("write", files=2):
+                pass
+    finally:
+        tracing.set_exporter(previous)
+
+    assert [s.name for s in trace.spans] == ["prompt", "write"]
+    assert trace.server_timing().startswith("prompt;dur=")
+    spans = exporter.recent("req-1")
+    assert len(spans) == 2
+    assert spans[1]["attributes"] == {"files": 2}
+
+
+def test_server_timing_header():
+    client = TestClient(app)
+    response = client.get("/ping")
+    assert response.status_code == 200
+    assert "total;dur=" in response.headers["Server-Timing"]
+
+
+def test_system_endpoints_are_not_exported():
+    exporter = tracing.InMemoryExporter(capacity=10)
+    previous = tracing.get_exporter()
+    tracing.set_exporter(exporter)
+    try:
+        response = TestClient(app).get("/health")
+    finally:
+        tracing.set_exporter(previous)
+    assert "total;dur=" in response.headers["Server-Timing"]
+    assert exporter.recent() == []
+
+
+def test_json_lines_exporter_writes_in_background(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    exporter = tracing.JsonLinesExporter(str(path), flush_interval=0.05)
+    for name in ("prompt", "write"):
+        exporter.export(tracing.Span(name, "req-1", {}))
+    exporter.close()
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["prompt", "write"]
+
+
+if __name__ == "__main__":
+    test_spans_are_recorded_per_request()
+    test_server_timing_header()
+    test_system_endpoints_are_not_exported()
+    print("Tracing tests passed.")
@@ -0,0 +1,77 @@
+import json
+from backend.app.services.verify import discover_apps, smoke_test_app, verify_apps
+
+WORKING_APP = '''from fastapi import FastAPI
+
+app = FastAPI()
+
+@app.get("/")
+async def root():
+    return {"message": "hello"}
+
+@app.get("/items/{item_id}")
+async def get_item(item_id: int):
+    return {"id": item_id}
+'''
+
+BROKEN_APP = '''from fastapi import FastAPI
+
+app = FastAPI()
+
+@app.get("/")
+async def root():
+    return {"message": undefined_name}
+'''
+
+HANGING_APP = '''from fastapi import FastAPI
+
+app = FastAPI()
+
+while True:
+    pass
+'''
+
+
+def _write_app(root, slug, code):
+    backend = root / slug / "backend"
+    backend.mkdir(parents=True)
+    (backend / "main.py").write_text(code)
+    return str(root / slug)
+
+
+def test_smoke_test_records_manifest(tmp_path):
+    app_dir = _write_app(tmp_path, "working-app", WORKING_APP)
+    result = smoke_test_app(app_dir)
+    assert result["passed"]
+    # Routes with path parameters are skipped
+    assert [r["path"] for r in result["routes"]] == ["/"]
+    manifest = json.loads((tmp_path / "working-app" / "manifest.json").read_text())
+    assert manifest["verification"]["passed"]
+
+
+def test_verify_apps_in_worker_pool(tmp_path):
+    _write_app(tmp_path, "working-app", WORKING_APP)
+    _write_app(tmp_path, "broken-app", BROKEN_APP)
+    _write_app(tmp_path, "import-error-app", "raise RuntimeError('boom')\n")
+    results = verify_apps(discover_apps(str(tmp_path)), workers=2)
+    outcome = {r["slug"]: r["passed"] for r in results}
+    assert outcome == {"broken-app": False, "import-error-app": False, "working-app": True}
+    assert next(r for r in results if r["slug"] == "import-error-app")["error"].startswith("RuntimeError")
+
+
+def test_hung_app_times_out_without_blocking_others(tmp_path):
+    _write_app(tmp_path, "hanging-app", HANGING_APP)
+    _write_app(tmp_path, "working-app", WORKING_APP)
+    results = verify_apps(discover_apps(str(tmp_path)), workers=1, timeout=5)
+    outcome = {r["slug"]: (r["passed"], r["error"]) for r in results}
+    assert outcome == {"hanging-app": (False, "timeout"), "working-app": (True, None)}
+    manifest = json.loads((tmp_path / "hanging-app" / "manifest.json").read_text())
+    assert manifest["verification"]["error"] == "timeout"
+
+
+if __name__ == "__main__":
+    import tempfile, pathlib
+    test_smoke_test_records_manifest(pathlib.Path(tempfile.mkdtemp()))
+    test_verify_apps_in_worker_pool(pathlib.Path(tempfile.mkdtemp()))
+    test_hung_app_times_out_without_blocking_others(pathlib.Path(tempfile.mkdtemp()))
+    print("Verification tests passed.")